@@ -10,6 +10,7 @@ from typing import Any, Optional, Type, Union, cast
 
 from sqlalchemy import Engine, create_engine, desc, event, select
 from sqlalchemy.orm import Session, class_mapper, sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from readwise_local_plus.config import UserConfig, fetch_user_config
 from readwise_local_plus.models import (
@@ -42,6 +43,12 @@ def safe_create_sqlite_engine(
     For more details, see:
     https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#foreign-key-support
 
+    The connection pool is chosen explicitly. Every new connection to ``':memory:'``
+    opens a new, empty database, so in-memory engines use a ``StaticPool`` holding a
+    single connection shared by all sessions. Database files use a ``QueuePool`` so
+    connections are reused rather than reopened. See:
+    https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#threading-pooling-behavior
+
     Parameters
     ----------
     sqlite_database : Union[str, Path]
@@ -65,7 +72,15 @@ def safe_create_sqlite_engine(
         cursor.close()
 
     db_path = "sqlite:///" + str(sqlite_database)
-    engine = create_engine(db_path, echo=echo)
+    if str(sqlite_database) == ":memory:":
+        engine = create_engine(
+            db_path,
+            echo=echo,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+        )
+    else:
+        engine = create_engine(db_path, echo=echo, poolclass=QueuePool)
     event.listen(engine, "connect", set_sqlite_pragma)
     return engine
 
@@ -85,9 +100,16 @@ def get_session(database_path: str | Path) -> Session:
 
 
 def create_database(database_path: str | Path) -> None:
-    """Create the database schema. This should only be called during setup."""
+    """
+    Create the database schema. This should only be called during setup.
+
+    The database is assumed to be new, so tables are created in a single transaction
+    without first checking whether each one exists (``checkfirst=False``). Calling this
+    on a database that already has the tables raises an ``OperationalError``.
+    """
     engine = safe_create_sqlite_engine(database_path)
-    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        Base.metadata.create_all(connection, checkfirst=False)
 
 
 def check_database(user_config: Optional[UserConfig] = None) -> None | datetime:
@@ -6,15 +6,24 @@ in multiple test modules, in the `tests/helpers.py` module.
 
 """
 
-from collections.abc import Generator
+from collections.abc import Generator, Mapping
+from types import MappingProxyType
+from typing import Any
+from uuid import uuid4
 
 import pytest
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from readwise_local_plus.config import UserConfig
 from readwise_local_plus.db_operations import safe_create_sqlite_engine
 from readwise_local_plus.models import Base
-from tests.helpers import DbHandle
+from tests.helpers import (
+    VALIDATED_FLATTENED_OBJS,
+    DbHandle,
+    copy_mem_db,
+    create_mem_db_engine,
+)
 
 
 @pytest.fixture
@@ -60,17 +69,108 @@ def mock_user_config_module_scoped(
     return user_config
 
 
+@pytest.fixture(scope="module")
+def mock_book() -> Mapping[str, Any]:
+    """
+    Return a fully validated, flattened mock book.
+
+    Read-only and shared by the module. To change a field, build a new dict e.g.
+    ``{**mock_book, "field": value}``.
+    """
+    return MappingProxyType(VALIDATED_FLATTENED_OBJS["books"][0])
+
+
+@pytest.fixture(scope="module")
+def mock_highlight() -> Mapping[str, Any]:
+    """
+    Return a fully validated, flattened mock highlight.
+
+    Read-only and shared by the module. To change a field, build a new dict e.g.
+    ``{**mock_highlight, "field": value}``.
+    """
+    return MappingProxyType(VALIDATED_FLATTENED_OBJS["highlights"][0])
+
+
+@pytest.fixture(scope="session")
+def mem_db_engine() -> Generator[Engine]:
+    """
+    Create an in-memory SQLite database once per test session and return the engine.
+
+    Creates tables for all ORM mapped classes that inherit from Base. Don't use
+    directly: use ``mem_db``, which empties the tables after each test.
+
+    Durability PRAGMAs are turned off, as nothing outlives the test session. Exclusive
+    locking is safe as the StaticPool holds a single connection.
+    """
+    engine = create_mem_db_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def mem_db_sessionmaker(mem_db_engine: Engine) -> sessionmaker[Session]:
+    """
+    Return a session factory for ``mem_db_engine``, configured once per test session.
+
+    Nothing else writes to the database, so objects aren't expired on commit. A test
+    that commits and then reads back on the same session must bypass the identity map
+    explicitly, e.g. ``session.get(..., populate_existing=True)``, to check the
+    persisted row.
+    """
+    return sessionmaker(bind=mem_db_engine, expire_on_commit=False)
+
+
 @pytest.fixture()
-def mem_db() -> Generator["DbHandle"]:
+def mem_db(
+    mem_db_engine: Engine, mem_db_sessionmaker: sessionmaker[Session]
+) -> Generator["DbHandle"]:
     """
-    Create an in-memory SQLite database and return an engine and session.
+    Return an engine and session for an empty in-memory SQLite database.
 
-    Creates tables for all ORM mapped classes that inherit from Base.
+    The schema is shared across the test session rather than created for every test.
+    Each test is isolated by deleting all rows once it completes. (Rolling back an outer
+    transaction isn't an option, as tests commit through their own sessions on the same
+    engine).
     """
-    engine = safe_create_sqlite_engine(":memory:", echo=False)
-    Base.metadata.create_all(engine)
-    # This isn't needed. It's included as a best practice example or for future use.
-    SessionMaker = sessionmaker(bind=engine)
-    session = SessionMaker()
-    yield DbHandle(engine, session)
+    session = mem_db_sessionmaker()
+    yield DbHandle(mem_db_engine, session)
     session.close()
+    with mem_db_engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+
+
+@pytest.fixture(scope="session")
+def mem_db_schema_template() -> Generator[Engine]:
+    """
+    Create an in-memory SQLite database with all tables, but no rows, once per session.
+
+    Don't write to it: it's copied by fixtures that need an empty database of their own.
+    """
+    engine = create_mem_db_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def mem_db_shared(mem_db_schema_template: Engine) -> Generator[str]:
+    """
+    Create a named, shared-cache in-memory SQLite database and return its path.
+
+    For tests that need several independent engines/sessions to see the same database
+    (e.g. via ``get_session``) but don't exercise anything on disk. The path can be
+    passed anywhere a database file path is expected. Use ``mock_user_config.db_path``
+    for tests that genuinely need a database file.
+
+    A shared-cache in-memory database only exists while a connection to it is open, so
+    a connection is held open for the duration of the test. The schema is copied from
+    ``mem_db_schema_template`` rather than created for every test.
+    """
+    db_path = f"file:{uuid4().hex}?mode=memory&cache=shared&uri=true"
+    engine = safe_create_sqlite_engine(db_path, echo=False)
+    with engine.connect() as keep_alive_connection:
+        copy_mem_db(
+            mem_db_schema_template, keep_alive_connection.connection.driver_connection
+        )
+        yield db_path
+    engine.dispose()
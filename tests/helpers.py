@@ -12,13 +12,16 @@ Data moves from:
 to the database, with each stage adding validation and flattening the data.
 """
 
+import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import Engine
+from sqlalchemy import Engine, event
 from sqlalchemy.orm import Session
 
+from readwise_local_plus.db_operations import safe_create_sqlite_engine
+from readwise_local_plus.models import Base
 from readwise_local_plus.types import FetchFn, FlattenFn, ValidateNestedObjFn
 
 
@@ -39,6 +42,98 @@ class DbHandle:
     session: Session
 
 
+def set_test_sqlite_pragmas(
+    dbapi_connection: sqlite3.Connection, connection_record: Any
+) -> None:
+    """
+    Turn off SQLite durability features that are pure overhead for a test database.
+
+    Register as a ``connect`` event listener on a test engine. Foreign key enforcement,
+    set by ``safe_create_sqlite_engine``, is unaffected.
+
+    Parameters
+    ----------
+    dbapi_connection: sqlite3.Connection
+        The new DBAPI connection.
+    connection_record: Any
+        The connection's pool record (unused).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_mem_db_engine() -> Engine:
+    """
+    Create an in-memory SQLite database with all tables and return the engine.
+
+    Creates tables for all ORM mapped classes that inherit from Base. Durability
+    PRAGMAs are turned off with ``set_test_sqlite_pragmas``.
+
+    Returns
+    -------
+    Engine
+        An engine bound to the in-memory database.
+    """
+    engine = safe_create_sqlite_engine(":memory:", echo=False)
+    event.listen(engine, "connect", set_test_sqlite_pragmas)
+    # The database is new, so skip checking whether each table exists.
+    Base.metadata.create_all(engine, checkfirst=False)
+    return engine
+
+
+def copy_mem_db(template: Engine, target: sqlite3.Connection) -> None:
+    """
+    Copy an in-memory SQLite database into the database behind a DBAPI connection.
+
+    Uses SQLite's backup API, which copies the database page by page. Any existing
+    content of the target database is replaced.
+
+    Parameters
+    ----------
+    template: Engine
+        An engine bound to the in-memory database to copy.
+    target: sqlite3.Connection
+        A connection to the database to copy into.
+    """
+    source = template.raw_connection()
+    try:
+        source.driver_connection.backup(target)
+    finally:
+        source.close()
+
+
+def clone_mem_db_engine(template: Engine) -> Engine:
+    """
+    Copy an in-memory SQLite database and return an engine for the copy.
+
+    Uses SQLite's backup API, which copies the database page by page. This is quicker
+    than recreating the schema and replaying the inserts for each test that needs its
+    own writable database.
+
+    Parameters
+    ----------
+    template: Engine
+        An engine bound to the in-memory database to copy.
+
+    Returns
+    -------
+    Engine
+        An engine bound to a new in-memory database with the same content.
+    """
+    engine = safe_create_sqlite_engine(":memory:", echo=False)
+    event.listen(engine, "connect", set_test_sqlite_pragmas)
+    target = engine.raw_connection()
+    try:
+        copy_mem_db(template, target.driver_connection)
+    finally:
+        target.close()
+    return engine
+
+
 def mock_api_response() -> list[dict[str, Any]]:
     """
     Mock a Readwise 'Highlight EXPORT' endpoint ``response.json()["results"]`` output.
@@ -186,3 +281,10 @@ def flat_mock_api_response_fully_validated(
     mock_highlight["updated_at"] = datetime(2025, 1, 1, 0, 1, 20)
 
     return flattened_output
+
+
+# Built once and shared across test modules, for test case generation, the
+# ``mock_book`` and ``mock_highlight`` fixtures and populating databases. Never mutate
+# it: to change a field, copy the object e.g. ``{**obj, "field": value}``. For data a
+# test can change freely, call ``flat_mock_api_response_fully_validated``.
+VALIDATED_FLATTENED_OBJS = flat_mock_api_response_fully_validated()
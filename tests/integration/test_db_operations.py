@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Generator
 from datetime import datetime, timezone
 from typing import Union
 
@@ -9,10 +10,8 @@ from sqlalchemy.orm import Session
 from readwise_local_plus.db_operations import (
     DatabasePopulaterFlattenedData,
     get_session,
-    safe_create_sqlite_engine,
 )
 from readwise_local_plus.models import (
-    Base,
     Book,
     BookTag,
     BookVersion,
@@ -21,35 +20,38 @@ from readwise_local_plus.models import (
     HighlightVersion,
     ReadwiseBatch,
 )
-from tests.helpers import DbHandle, flat_mock_api_response_fully_validated
+from tests.helpers import VALIDATED_FLATTENED_OBJS, create_mem_db_engine
 
 logger = logging.getLogger(__name__)
 
 # Reusable mock value
 ANYTIME = datetime(2025, 1, 1, 1, 1, 1, tzinfo=timezone.utc)
 
+
 # ----------
 #  Fixtures
 # ----------
 
 
-@pytest.fixture()
-def mock_book() -> dict:
-    return flat_mock_api_response_fully_validated()["books"][0]
-
-
-@pytest.fixture()
-def mock_highlight() -> dict:
-    return flat_mock_api_response_fully_validated()["highlights"][0]
-
+@pytest.fixture(scope="module")
+def populated_mem_db_session() -> Generator[Session]:
+    """
+    Populate an in-memory database from the mock objects once per module.
 
-@pytest.fixture()
-def setup_db(mock_user_config):
-    # NOTE: Coupled to upstream functions for ease and table consistency, but beware
-    # upstream changes that may affect tests using this fixture.
-    engine = safe_create_sqlite_engine(mock_user_config.db_path, echo=False)
-    Base.metadata.create_all(engine)
-    return mock_user_config.db_path
+    Return a session that wasn't used to populate the database, so objects are read
+    from the database rather than the populating session's identity map. Tests must not
+    write to the database.
+    """
+    engine = create_mem_db_engine()
+    with Session(engine) as session:
+        DatabasePopulaterFlattenedData(
+            session, VALIDATED_FLATTENED_OBJS, ANYTIME, ANYTIME
+        ).populate_database()
+        # During usage, this is done in the pipeline caller.
+        session.commit()
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
 
 
 def add_batch(db_path):
@@ -88,8 +90,8 @@ def create_test_cases_from_flattened_mock_api(flattened_mock_api_response: dict)
         "highlight_tags": HighlightTag,
     }
     test_cases = []
-    for object_type in flattened_mock_api_response.keys():
-        target_object = flattened_mock_api_response[object_type][0]
+    for object_type, objects in flattened_mock_api_response.items():
+        target_object = objects[0]
         for field, value in target_object.items():
             test_cases.append((orm_models[object_type], field, value))
     return test_cases
@@ -97,31 +99,20 @@ def create_test_cases_from_flattened_mock_api(flattened_mock_api_response: dict)
 
 @pytest.mark.parametrize(
     "orm_obj, target_field, expected_value",
-    create_test_cases_from_flattened_mock_api(flat_mock_api_response_fully_validated()),
+    create_test_cases_from_flattened_mock_api(VALIDATED_FLATTENED_OBJS),
 )
 def test_db_populater_flattened_populate_database(
-    mem_db: DbHandle,
+    populated_mem_db_session: Session,
     orm_obj: Union[Book, BookTag, Highlight, HighlightTag],
     target_field: str,
     expected_value: Union[str, int],
 ):
-    validated_flattened_objs = flat_mock_api_response_fully_validated()
-    database_populater = DatabasePopulaterFlattenedData(
-        mem_db.session, validated_flattened_objs, ANYTIME, ANYTIME
-    )
-    database_populater.populate_database()
-
-    # During usage, this is done in the pipeline caller.
-    mem_db.session.commit()
+    actual_obj = populated_mem_db_session.scalars(select(orm_obj).limit(1)).first()
+    assert getattr(actual_obj, target_field) == expected_value
 
-    with Session(mem_db.engine) as clean_session:
-        fetched_objects = clean_session.scalars(select(orm_obj)).all()
-        actual_obj = fetched_objects[0]
-        assert getattr(actual_obj, target_field) == expected_value
 
-
-def test_book_versioning_for_a_changed_book(setup_db, mock_book):
-    db_path = setup_db
+def test_book_versioning_for_a_changed_book(mem_db_shared, mock_book):
+    db_path = mem_db_shared
 
     # Add original book
     batch_1, session_1 = add_batch(db_path)
@@ -130,12 +121,12 @@ def test_book_versioning_for_a_changed_book(setup_db, mock_book):
         session_1.add(book)
 
     # Update book data
-    mock_book["author"] = "Updated Author"
+    updated_book = {**mock_book, "author": "Updated Author"}
 
     batch_2, session_2 = add_batch(db_path)
     dbp = DatabasePopulaterFlattenedData(
         session_2,
-        {"books": [mock_book]},
+        {"books": [updated_book]},
         ANYTIME,
         ANYTIME,
     )
@@ -155,9 +146,9 @@ def test_book_versioning_for_a_changed_book(setup_db, mock_book):
 
 
 def test_highlight_versioning_for_a_changed_highlight(
-    setup_db, mock_book, mock_highlight
+    mem_db_shared, mock_book, mock_highlight
 ):
-    db_path = setup_db
+    db_path = mem_db_shared
 
     # Add original highlight
     batch_1, session_1 = add_batch(db_path)
@@ -167,12 +158,12 @@ def test_highlight_versioning_for_a_changed_highlight(
         session_1.add_all([book, hl])
 
     # Update highlight
-    mock_highlight["text"] = "Updated text"
+    updated_highlight = {**mock_highlight, "text": "Updated text"}
 
     batch_2, session_2 = add_batch(db_path)
     dbp = DatabasePopulaterFlattenedData(
         session_2,
-        {"highlights": [mock_highlight]},
+        {"highlights": [updated_highlight]},
         ANYTIME,
         ANYTIME,
     )
@@ -191,8 +182,8 @@ def test_highlight_versioning_for_a_changed_highlight(
         assert versions[0].text != highlights[0].text
 
 
-def test_book_versioning_no_changes(setup_db, mock_book):
-    db_path = setup_db
+def test_book_versioning_no_changes(mem_db_shared, mock_book):
+    db_path = mem_db_shared
 
     # Add original book
     batch_1, session_1 = add_batch(db_path)
@@ -221,8 +212,8 @@ def test_book_versioning_no_changes(setup_db, mock_book):
         assert len(versions) == 0
 
 
-def test_highlight_versioning_no_changes(setup_db, mock_book, mock_highlight):
-    db_path = setup_db
+def test_highlight_versioning_no_changes(mem_db_shared, mock_book, mock_highlight):
+    db_path = mem_db_shared
 
     # Add original highlight
     batch_1, session_1 = add_batch(db_path)
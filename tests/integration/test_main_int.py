@@ -198,10 +198,14 @@ def create_invalid_readwise_objects_for_testing() -> dict[
     }
 
 
+# Built once and shared by the parametrize values and ids.
+INVALID_OBJECT_CASES = create_invalid_readwise_objects_for_testing()
+
+
 @pytest.mark.parametrize(
     "mock_obj, expected",
-    create_invalid_readwise_objects_for_testing().values(),
-    ids=create_invalid_readwise_objects_for_testing().keys(),
+    INVALID_OBJECT_CASES.values(),
+    ids=list(INVALID_OBJECT_CASES),
 )
 def test_integration_of_nested_obj_validation_functions(
     mock_obj: dict[str, Any], expected: dict[str, Any]
@@ -4,9 +4,10 @@ from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
-from sqlalchemy import Column, ForeignKey, Integer
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Column, ForeignKey, Integer, select
+from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import Pool, QueuePool, StaticPool
 
 from readwise_local_plus.config import UserConfig
 from readwise_local_plus.db_operations import (
@@ -18,7 +19,7 @@ from readwise_local_plus.db_operations import (
     safe_create_sqlite_engine,
     update_readwise_last_fetch,
 )
-from readwise_local_plus.models import Base, ReadwiseBatch, ReadwiseLastFetch
+from readwise_local_plus.models import Base, ReadwiseLastFetch
 from tests.helpers import DbHandle, flat_mock_api_response_fully_validated
 
 logger = logging.getLogger(__name__)
@@ -27,37 +28,21 @@ logger = logging.getLogger(__name__)
 ANYTIME = datetime(2025, 1, 1, 1, 1, 1)
 
 
-# ----------
-#  Fixtures
-# ----------
-
-
-@pytest.fixture()
-def mock_book() -> dict:
-    return flat_mock_api_response_fully_validated()["books"][0]
-
+# Minimal models for checking foreign key enforcement. Declared once at import, not in
+# the test, so the declarative mapping isn't rebuilt on every run.
+class ForeignKeyBase(DeclarativeBase):
+    pass
 
-@pytest.fixture()
-def mock_highlight() -> dict:
-    return flat_mock_api_response_fully_validated()["highlights"][0]
 
+class Parent(ForeignKeyBase):
+    __tablename__ = "parent"
+    id = Column(Integer, primary_key=True)
 
-@pytest.fixture()
-def setup_db(mock_user_config):
-    # NOTE: Coupled to upstream functions for ease and table consistency, but beware
-    # upstream changes that may affect tests using this fixture.
-    engine = safe_create_sqlite_engine(mock_user_config.db_path, echo=False)
-    Base.metadata.create_all(engine)
-    return mock_user_config.db_path
 
-
-def add_batch(db_path):
-    session = get_session(db_path)
-    with session.begin():
-        batch = ReadwiseBatch(start_time=ANYTIME, end_time=ANYTIME)
-        session.add(batch)
-        session.flush()
-        return batch, session
+class Child(ForeignKeyBase):
+    __tablename__ = "child"
+    id = Column(Integer, primary_key=True)
+    parent_id = Column(Integer, ForeignKey("parent.id"))
 
 
 # ----------
@@ -67,26 +52,38 @@ def add_batch(db_path):
 
 def test_safe_create_sqlite_engine_raises_for_a_missing_foreign_key():
     test_engine = safe_create_sqlite_engine(":memory:")
-
-    class TestBase(DeclarativeBase):
-        pass
-
-    class Parent(TestBase):
-        __tablename__ = "parent"
-        id = Column(Integer, primary_key=True)
-
-    class Child(TestBase):
-        __tablename__ = "child"
-        id = Column(Integer, primary_key=True)
-        parent_id = Column(Integer, ForeignKey("parent.id"))
-
-    TestBase.metadata.create_all(test_engine)
+    ForeignKeyBase.metadata.create_all(test_engine)
     # We want this to raise because the parent_id doesn't exist in the db.
     with pytest.raises(IntegrityError):
         with Session(test_engine) as session, session.begin():
             session.add(Child(id=1, parent_id=999))
 
 
+@pytest.mark.parametrize(
+    "in_memory, expected_pool",
+    [
+        (True, StaticPool),
+        (False, QueuePool),
+    ],
+)
+def test_safe_create_sqlite_engine_pool_class(
+    mock_user_config: UserConfig, in_memory: bool, expected_pool: type[Pool]
+):
+    sqlite_database = ":memory:" if in_memory else mock_user_config.db_path
+    engine = safe_create_sqlite_engine(sqlite_database)
+    assert isinstance(engine.pool, expected_pool)
+
+
+def test_safe_create_sqlite_engine_sessions_share_an_in_memory_database():
+    engine = safe_create_sqlite_engine(":memory:")
+    Base.metadata.create_all(engine, tables=[ReadwiseLastFetch.__table__])
+    with Session(engine) as session, session.begin():
+        session.add(ReadwiseLastFetch(last_successful_fetch=ANYTIME))
+    with Session(engine) as session:
+        fetched = session.scalars(select(ReadwiseLastFetch)).one()
+        assert fetched.last_successful_fetch == ANYTIME
+
+
 def test_get_session_returns_a_session_object(mock_user_config: UserConfig):
     actual = get_session(mock_user_config.db_path)
     assert isinstance(actual, Session)
@@ -120,6 +117,12 @@ def test_create_database_tables_created(mock_user_config: UserConfig):
     assert sorted(actual) == sorted(expected)
 
 
+def test_create_database_raises_if_tables_exist(mock_user_config: UserConfig):
+    create_database(mock_user_config.db_path)
+    with pytest.raises(OperationalError, match="already exists"):
+        create_database(mock_user_config.db_path)
+
+
 @patch("readwise_local_plus.db_operations.create_database")
 def test_check_database_when_database_doesnt_exist(
     mock_create_database: MagicMock, mock_user_config: UserConfig
@@ -159,7 +162,7 @@ def test_database_populater_flattened_instantiates_with_expected_attrs(
         ANYTIME,
         ANYTIME,
     )
-    assert list(database_populater.__dict__.keys()) == [
+    assert list(database_populater.__dict__) == [
         "session",
         "validated_flattened_objs",
         "start_fetch",
@@ -178,7 +181,9 @@ def test_update_readwise_last_fetch(mem_db: DbHandle):
         update_readwise_last_fetch(mem_db.session, start_current_fetch=mock_fetch)
         mem_db.session.commit()
 
-        actual_record = mem_db.session.get(ReadwiseLastFetch, 1)
+        # mem_db sessions don't expire objects on commit: reload the stored row rather
+        # than reading the identity map's copy.
+        actual_record = mem_db.session.get(ReadwiseLastFetch, 1, populate_existing=True)
         assert actual_record.last_successful_fetch == mock_fetch
 
         total_records = mem_db.session.query(ReadwiseLastFetch).count()
@@ -1,11 +1,11 @@
-from copy import deepcopy
 from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
 from typing import Any, Callable
 
 import pytest
 from sqlalchemy import Engine, inspect, select, text
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from readwise_local_plus.models import (
     Base,
@@ -17,34 +17,56 @@ from readwise_local_plus.models import (
     HighlightVersion,
     ReadwiseBatch,
 )
-from tests.helpers import DbHandle
+from tests.helpers import DbHandle, clone_mem_db_engine, create_mem_db_engine
 
-# Minimal object configurations.
-MIN_HIGHLIGHT_1_TAG_2 = {"id": 5556, "name": "blue"}
-MIN_HIGHLIGHT_1_TAG_1 = {"id": 5555, "name": "orange"}
-MIN_HIGHLIGHT_2 = {"id": 222, "book_id": 99, "text": "highlight_2"}
-MIN_HIGHLIGHT_1 = {"id": 111, "book_id": 99, "text": "highlight_1"}
-MIN_BOOK_TAG_2 = {"id": 9991, "name": "book_tag_2"}
-MIN_BOOK_TAG_1 = {"id": 9990, "name": "book_tag_1"}
-MIN_BOOK = {"user_book_id": 99, "title": "book_1"}
+# Under pytest-xdist ``--dist=loadgroup``, keep the module on one worker so its module
+# scoped databases are only built once.
+pytestmark = pytest.mark.xdist_group("models")
 
 VALIDATION_KEYS = {"validated": True, "validation_errors": {}}
 
-MIN_HIGHLIGHT_1_TAG_2.update(VALIDATION_KEYS)
-MIN_HIGHLIGHT_1_TAG_1.update(VALIDATION_KEYS)
-MIN_HIGHLIGHT_2.update(VALIDATION_KEYS)
-MIN_HIGHLIGHT_1.update(VALIDATION_KEYS)
-MIN_BOOK_TAG_2.update(VALIDATION_KEYS)
-MIN_BOOK_TAG_1.update(VALIDATION_KEYS)
-MIN_BOOK.update(VALIDATION_KEYS)
+# Minimal object configurations. Read-only: build a new dict to vary one.
+MIN_HIGHLIGHT_1_TAG_2 = MappingProxyType(
+    {"id": 5556, "name": "blue", **VALIDATION_KEYS}
+)
+MIN_HIGHLIGHT_1_TAG_1 = MappingProxyType(
+    {"id": 5555, "name": "orange", **VALIDATION_KEYS}
+)
+MIN_HIGHLIGHT_2 = MappingProxyType(
+    {"id": 222, "book_id": 99, "text": "highlight_2", **VALIDATION_KEYS}
+)
+MIN_HIGHLIGHT_1 = MappingProxyType(
+    {"id": 111, "book_id": 99, "text": "highlight_1", **VALIDATION_KEYS}
+)
+MIN_BOOK_TAG_2 = MappingProxyType({"id": 9991, "name": "book_tag_2", **VALIDATION_KEYS})
+MIN_BOOK_TAG_1 = MappingProxyType({"id": 9990, "name": "book_tag_1", **VALIDATION_KEYS})
+MIN_BOOK = MappingProxyType({"user_book_id": 99, "title": "book_1", **VALIDATION_KEYS})
 
 START_TIME = datetime(2025, 1, 1, 10, 10, 10)
 END_TIME = datetime(2025, 1, 1, 10, 10, 20)
 DATABASE_WRITE_TIME = datetime(2025, 1, 1, 10, 10, 22)
 
-# ReadwiseBatch expected to autoincrement to this value.
+# ReadwiseBatch id assigned by the fixtures. It matches the autoincrement value for
+# the first batch, which later batches count on.
 BATCH_ID = 1
 
+# Primary keys of the objects in ``MOCK_VALIDATED_FLAT_OBJS``.
+FULL_BOOK_ID = 12345
+FULL_BOOK_TAG_ID = 4041
+FULL_HIGHLIGHT_ID = 10
+FULL_HIGHLIGHT_TAG_ID = 97654
+
+TABLE_NAMES = [
+    "book_tags",
+    "book_versions",
+    "books",
+    "highlight_tags",
+    "highlight_versions",
+    "highlights",
+    "readwise_batches",
+    "readwise_last_fetch",
+]
+
 
 def unnested_minimal_objects():
     """
@@ -62,38 +84,50 @@ def unnested_minimal_objects():
     """
 
     # Add foreign keys. These are added to objects when they are flattened.
-    min_book_tag = deepcopy(MIN_BOOK_TAG_1)
-    min_book_tag["user_book_id"] = MIN_BOOK["user_book_id"]
-    min_highlight = deepcopy(MIN_HIGHLIGHT_1)
-    min_highlight["book_id"] = MIN_BOOK["user_book_id"]
-    min_highlight_tag = deepcopy(MIN_HIGHLIGHT_1_TAG_1)
-    min_highlight_tag["highlight_id"] = MIN_HIGHLIGHT_1["id"]
-
     return {
-        "min_book": MIN_BOOK,
-        "min_book_tag": min_book_tag,
-        "min_highlight": min_highlight,
-        "min_highlight_tag": min_highlight_tag,
+        "min_book": dict(MIN_BOOK),
+        "min_book_tag": {**MIN_BOOK_TAG_1, "user_book_id": MIN_BOOK["user_book_id"]},
+        "min_highlight": {**MIN_HIGHLIGHT_1, "book_id": MIN_BOOK["user_book_id"]},
+        "min_highlight_tag": {
+            **MIN_HIGHLIGHT_1_TAG_1,
+            "highlight_id": MIN_HIGHLIGHT_1["id"],
+        },
         "batch_id": BATCH_ID,
     }
 
 
-def mock_validated_flat_objs():
+def freeze(value: Any) -> Any:
     """
-    Mock output of ``<pydantic_schema>.model_dump()`` for a pydantic verified book.
+    Return a read-only version of nested test data.
 
-    Output contains one book with one highlight. Use a function rather than a constant
-    to ensure test isolation.
+    Dictionaries become ``MappingProxyType`` and lists become tuples. The values of
+    ``validation_errors`` are left as dictionaries as they're written to a JSON column.
+
+    Parameters
+    ----------
+    value: Any
+        A dictionary, list or scalar.
 
     Returns
     -------
-    list[dict[str, Any]]
-        A list of dictionaries where each dictionary is a Pydantic verified Readwise
-        book with highlights.
+    Any
+        The frozen value.
     """
-    return [
+    if isinstance(value, dict):
+        return MappingProxyType(
+            {k: v if k == "validation_errors" else freeze(v) for k, v in value.items()}
+        )
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# Mock output of ``<pydantic_schema>.model_dump()`` for a pydantic verified book with
+# one book tag and one highlight with one tag. Frozen, so tests can share it.
+MOCK_VALIDATED_FLAT_OBJS = freeze(
+    [
         {
-            "user_book_id": 12345,
+            "user_book_id": FULL_BOOK_ID,
             "title": "book title",
             "is_deleted": False,
             "author": "name surname",
@@ -104,7 +138,7 @@ def mock_validated_flat_objs():
             "summary": None,
             "book_tags": [
                 {
-                    "id": 4041,
+                    "id": FULL_BOOK_TAG_ID,
                     "name": "book_tag",
                     "validated": True,
                     "validation_errors": {},
@@ -117,7 +151,7 @@ def mock_validated_flat_objs():
             "asin": None,
             "highlights": [
                 {
-                    "id": 10,
+                    "id": FULL_HIGHLIGHT_ID,
                     "text": "The highlight text",
                     "location": 1000,
                     "location_type": "location",
@@ -129,10 +163,10 @@ def mock_validated_flat_objs():
                     "external_id": None,
                     "end_location": None,
                     "url": None,
-                    "book_id": 12345,
+                    "book_id": FULL_BOOK_ID,
                     "tags": [
                         {
-                            "id": 97654,
+                            "id": FULL_HIGHLIGHT_TAG_ID,
                             "name": "favourite",
                             "validated": True,
                             "validation_errors": {},
@@ -150,6 +184,7 @@ def mock_validated_flat_objs():
             "validated": True,
         }
     ]
+)
 
 
 def versioning_test_objs() -> dict[Base, dict[str, str]]:
@@ -165,20 +200,32 @@ def versioning_test_objs() -> dict[Base, dict[str, str]]:
 # ----------
 
 
-@pytest.fixture()
-def mem_db_containing_full_objects(mem_db: DbHandle):
+@pytest.fixture(scope="module")
+def mem_db_containing_full_objects():
     """
     Engine connected to an in-memory SQLite db with minimal records for all objects.
 
     Create a database with related entries for a book, highlight, highlight tag and a
     readwise batch.
 
+    Module scoped, with its own engine, as tests only read from it. Read through
+    ``ro_session`` rather than opening a session on the engine.
+
     """
-    batch = ReadwiseBatch(start_time=START_TIME, end_time=END_TIME)
-    book_data = mock_validated_flat_objs()[0]
-    book_tag = book_data.pop("book_tags")[0]
-    highlight = book_data.pop("highlights")[0]
-    tag = highlight.pop("tags")[0]
+    engine = create_mem_db_engine()
+    batch = ReadwiseBatch(
+        id=BATCH_ID,
+        start_time=START_TIME,
+        end_time=END_TIME,
+        database_write_time=DATABASE_WRITE_TIME,
+    )
+    book_src = MOCK_VALIDATED_FLAT_OBJS[0]
+    book_data = {
+        k: v for k, v in book_src.items() if k not in {"book_tags", "highlights"}
+    }
+    book_tag = book_src["book_tags"][0]
+    highlight = {k: v for k, v in book_src["highlights"][0].items() if k != "tags"}
+    tag = book_src["highlights"][0]["tags"][0]
 
     book_as_orm = Book(**book_data, batch=batch)
     book_tag_as_orm = BookTag(**book_tag, batch=batch)
@@ -189,18 +236,55 @@ def mem_db_containing_full_objects(mem_db: DbHandle):
     book_as_orm.book_tags = [book_tag_as_orm]
     book_as_orm.highlights = [highlight_as_orm]
 
-    with mem_db.session.begin():
-        mem_db.session.add(batch)
-        # Flush to generate batch id which is no nullable for other objects.
-        mem_db.session.flush()
-        mem_db.session.add(book_as_orm)
-        batch.database_write_time = DATABASE_WRITE_TIME
+    with Session(engine) as session, session.begin():
+        session.add_all([batch, book_as_orm])
 
-    yield mem_db.engine
+    yield engine
+    engine.dispose()
 
 
-@pytest.fixture()
-def mem_db_containing_minimal_objects(mem_db: DbHandle):
+@pytest.fixture(scope="module")
+def ro_session(mem_db_containing_full_objects: Engine):
+    """
+    A session on the full object database, shared by the read-only tests in the module.
+
+    The identity map is primed with every object and relationship, so ``get`` calls
+    and relationship access don't query the database. Tests must not modify the
+    objects: the session is only rolled back when the module completes, so a change
+    would leak into later tests.
+    """
+    with Session(mem_db_containing_full_objects) as session:
+        # The identity map is weak referencing: hold the graph while the session is used.
+        batches = session.scalars(
+            select(ReadwiseBatch).options(
+                selectinload(ReadwiseBatch.books).selectinload(Book.book_tags),
+                selectinload(ReadwiseBatch.books)
+                .selectinload(Book.highlights)
+                .selectinload(Highlight.tags),
+                selectinload(ReadwiseBatch.book_tags),
+                selectinload(ReadwiseBatch.highlights),
+                selectinload(ReadwiseBatch.highlight_tags),
+                selectinload(ReadwiseBatch.versioned_books),
+                selectinload(ReadwiseBatch.versioned_highlights),
+            )
+        ).all()
+        yield session
+        session.rollback()
+        del batches
+
+
+@pytest.fixture(scope="module")
+def full_objs(ro_session: Session):
+    """
+    Every full object, keyed by ``(type, primary key)``.
+
+    Read from ``ro_session``'s primed identity map, without querying the database.
+    """
+    return {(type(obj), inspect(obj).identity[0]): obj for obj in ro_session}
+
+
+@pytest.fixture(scope="module")
+def mem_db_containing_minimal_objects():
     """
     Engine connected to an in-memory SQLite db with minimal records for all objects.
 
@@ -215,8 +299,16 @@ def mem_db_containing_minimal_objects(mem_db: DbHandle):
     do not enforce the presence of non-nullable fields. Missing fields will error in
     pydantic data verification.
 
+    Module scoped, with its own engine, as tests only read from it.
+
     """
-    batch = ReadwiseBatch(start_time=START_TIME, end_time=END_TIME)
+    engine = create_mem_db_engine()
+    batch = ReadwiseBatch(
+        id=BATCH_ID,
+        start_time=START_TIME,
+        end_time=END_TIME,
+        database_write_time=DATABASE_WRITE_TIME,
+    )
 
     book_as_orm = Book(**MIN_BOOK)
     book_tag_1 = BookTag(**MIN_BOOK_TAG_1)
@@ -235,17 +327,14 @@ def mem_db_containing_minimal_objects(mem_db: DbHandle):
     batch.highlights = [highlight_1, highlight_2]
     batch.highlight_tags = [highlight_1_tag_1, highlight_1_tag_2]
 
-    with mem_db.session.begin():
-        mem_db.session.add(batch)
-        # Flush to generate batch id which is no nullable for other objects.
-        mem_db.session.flush()
-        mem_db.session.add(book_as_orm)
-        batch.database_write_time = DATABASE_WRITE_TIME
-    yield mem_db.engine
+    with Session(engine) as session, session.begin():
+        session.add_all([batch, book_as_orm])
+    yield engine
+    engine.dispose()
 
 
-@pytest.fixture()
-def mem_db_containing_unnested_minimal_objects(mem_db: DbHandle):
+@pytest.fixture(scope="module")
+def unnested_minimal_objects_template():
     """
     Engine with a db containing minimal object records, created from unnested data.
 
@@ -261,8 +350,17 @@ def mem_db_containing_unnested_minimal_objects(mem_db: DbHandle):
     do not enforce the presence of non-nullable fields. Missing fields will error in
     pydantic data verification.
 
+    Built once per module as a template. Tests use a copy made by
+    ``mem_db_containing_unnested_minimal_objects``.
+
     """
-    batch = ReadwiseBatch(start_time=START_TIME, end_time=END_TIME)
+    engine = create_mem_db_engine()
+    batch = ReadwiseBatch(
+        id=BATCH_ID,
+        start_time=START_TIME,
+        end_time=END_TIME,
+        database_write_time=DATABASE_WRITE_TIME,
+    )
 
     min_objs = unnested_minimal_objects()
 
@@ -271,27 +369,42 @@ def mem_db_containing_unnested_minimal_objects(mem_db: DbHandle):
     highlight_1 = Highlight(**min_objs["min_highlight"], batch=batch)
     highlight_1_tag_1 = HighlightTag(**min_objs["min_highlight_tag"], batch=batch)
 
-    with mem_db.session.begin():
-        mem_db.session.add(batch)
-        # Flush to generate batch id which is no nullable for other objects.
-        mem_db.session.flush()
-        mem_db.session.add_all(
-            [book_as_orm, book_tag_1, highlight_1, highlight_1_tag_1]
+    with Session(engine) as session, session.begin():
+        session.add_all(
+            [batch, book_as_orm, book_tag_1, highlight_1, highlight_1_tag_1]
         )
-        batch.database_write_time = DATABASE_WRITE_TIME
-    yield mem_db.engine
+    yield engine
+    engine.dispose()
 
 
 @pytest.fixture()
+def mem_db_containing_unnested_minimal_objects(
+    unnested_minimal_objects_template: Engine,
+):
+    """
+    Engine with a db containing minimal object records, created from unnested data.
+
+    A fresh copy of ``unnested_minimal_objects_template``, so tests may write to it.
+    """
+    engine = clone_mem_db_engine(unnested_minimal_objects_template)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
 def mem_db_multi_version_unnested_minimal_objects(
-    mem_db_containing_unnested_minimal_objects: Engine,
+    unnested_minimal_objects_template: Engine,
 ):
     """
     Engine with a db containing unnested minimal object records with multiple versions.
+
+    Module scoped, with its own copy of the unnested minimal object database, as tests
+    only read from it.
     """
+    engine = clone_mem_db_engine(unnested_minimal_objects_template)
     batch = ReadwiseBatch(start_time=START_TIME, end_time=END_TIME)
 
-    with Session(mem_db_containing_unnested_minimal_objects) as session:
+    with Session(engine) as session:
         test_objs = versioning_test_objs()
 
         for obj, test_values in test_objs.items():
@@ -312,83 +425,96 @@ def mem_db_multi_version_unnested_minimal_objects(
 
         session.commit()
 
-        yield mem_db_containing_unnested_minimal_objects.engine
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def multi_version_ro_session(mem_db_multi_version_unnested_minimal_objects: Engine):
+    """
+    A session on the multi version database, shared by the tests in the module.
+
+    Objects stay in the identity map, so repeat ``get`` calls don't query the database.
+    """
+    with Session(
+        mem_db_multi_version_unnested_minimal_objects,
+        autoflush=False,
+        expire_on_commit=False,
+    ) as session:
+        yield session
+        session.rollback()
 
 
 @pytest.fixture()
-def minimal_orm_object_model_dump(
-    mem_db_multi_version_unnested_minimal_objects: Engine,
-):
+def minimal_orm_object_model_dump(multi_version_ro_session: Session):
     def _fetch(cls: type):
-        with Session(mem_db_multi_version_unnested_minimal_objects) as session:
-            return session.scalars(select(cls)).first().dump_column_data()
+        return (
+            multi_version_ro_session.scalars(select(cls).limit(1))
+            .first()
+            .dump_column_data()
+        )
 
     return _fetch
 
 
+@pytest.fixture(scope="module")
+def minimal_objects_as_orm(mem_db_containing_minimal_objects: Engine):
+    """
+    The first of each minimal object, fetched by primary key once per module.
+
+    The session stays open for the module so relationships can lazy load. Tests must
+    not modify the objects.
+    """
+    with Session(mem_db_containing_minimal_objects) as clean_session:
+        yield SimpleNamespace(
+            book=clean_session.get(Book, MIN_BOOK["user_book_id"]),
+            book_tag=clean_session.get(BookTag, MIN_BOOK_TAG_1["id"]),
+            highlight=clean_session.get(Highlight, MIN_HIGHLIGHT_1["id"]),
+            highlight_tag=clean_session.get(HighlightTag, MIN_HIGHLIGHT_1_TAG_1["id"]),
+            batch=clean_session.get(ReadwiseBatch, BATCH_ID),
+        )
+
+
 @pytest.fixture()
-def minimal_book_as_orm(mem_db_containing_minimal_objects: Engine):
+def minimal_book_as_orm(minimal_objects_as_orm: SimpleNamespace):
     """A minimal ``Book`` fetched from the minimal object database."""
-    with Session(mem_db_containing_minimal_objects) as clean_session:
-        fetched_books = clean_session.scalars(select(Book)).all()
-        test_book = fetched_books[0]
-        yield test_book
+    return minimal_objects_as_orm.book
 
 
 @pytest.fixture()
-def minimal_book_tag_as_orm(mem_db_containing_minimal_objects: Engine):
+def minimal_book_tag_as_orm(minimal_objects_as_orm: SimpleNamespace):
     """A minimal ``BookTag`` fetched from the minimal object database."""
-    with Session(mem_db_containing_minimal_objects) as clean_session:
-        fetched_book_tags = clean_session.scalars(select(BookTag)).all()
-        test_book_tag = fetched_book_tags[0]
-        yield test_book_tag
+    return minimal_objects_as_orm.book_tag
 
 
 @pytest.fixture()
-def minimal_highlight_as_orm(mem_db_containing_minimal_objects: Engine):
+def minimal_highlight_as_orm(minimal_objects_as_orm: SimpleNamespace):
     """A minimal ``Highlight`` fetched from the minimal object database."""
-    with Session(mem_db_containing_minimal_objects) as clean_session:
-        fetched_highlights = clean_session.scalars(select(Highlight)).all()
-        test_highlight = fetched_highlights[0]
-        yield test_highlight
+    return minimal_objects_as_orm.highlight
 
 
 @pytest.fixture()
-def minimal_highlight_tag_as_orm(mem_db_containing_minimal_objects: Engine):
+def minimal_highlight_tag_as_orm(minimal_objects_as_orm: SimpleNamespace):
     """A minimal ``HighlightTag`` fetched from the minimal object database."""
-    with Session(mem_db_containing_minimal_objects) as clean_session:
-        fetched_highlight_tags = clean_session.scalars(select(HighlightTag)).all()
-        test_highlight_tag = fetched_highlight_tags[0]
-        yield test_highlight_tag
+    return minimal_objects_as_orm.highlight_tag
 
 
 @pytest.fixture()
-def minimal_batch_as_orm(mem_db_containing_minimal_objects: Engine):
+def minimal_batch_as_orm(minimal_objects_as_orm: SimpleNamespace):
     """A minimal ``ReadwiseBatch`` fetched from the minimal object database."""
-    with Session(mem_db_containing_minimal_objects) as clean_session:
-        fetched_batches = clean_session.scalars(select(ReadwiseBatch)).all()
-        test_batch = fetched_batches[0]
-        yield test_batch
+    return minimal_objects_as_orm.batch
 
 
 @pytest.fixture()
-def minimal_book_version_as_orm(mem_db_multi_version_unnested_minimal_objects: Engine):
+def minimal_book_version_as_orm(multi_version_ro_session: Session):
     """A minimal ``BookVersion`` fetched from the minimal object database."""
-    with Session(mem_db_multi_version_unnested_minimal_objects) as clean_session:
-        fetched_batches = clean_session.scalars(select(BookVersion)).all()
-        test_batch = fetched_batches[0]
-        yield test_batch
+    return multi_version_ro_session.scalars(select(BookVersion).limit(1)).first()
 
 
 @pytest.fixture()
-def minimal_highlight_version_as_orm(
-    mem_db_multi_version_unnested_minimal_objects: Engine,
-):
-    """A minimal ``BookVersion`` fetched from the minimal object database."""
-    with Session(mem_db_multi_version_unnested_minimal_objects) as clean_session:
-        fetched_batches = clean_session.scalars(select(HighlightVersion)).all()
-        test_batch = fetched_batches[0]
-        yield test_batch
+def minimal_highlight_version_as_orm(multi_version_ro_session: Session):
+    """A minimal ``HighlightVersion`` fetched from the minimal object database."""
+    return multi_version_ro_session.scalars(select(HighlightVersion).limit(1)).first()
 
 
 # ----------------------
@@ -397,7 +523,7 @@ def minimal_highlight_version_as_orm(
 
 
 def test_mem_db(mem_db: DbHandle):
-    with mem_db.engine.connect() as conn:
+    with mem_db.engine.begin() as conn:
         conn.execute(text("CREATE TABLE some_table (x int, y int)"))
         conn.execute(
             text("INSERT INTO some_table (x, y) VALUES (:x, :y)"),
@@ -405,25 +531,32 @@ def test_mem_db(mem_db: DbHandle):
         )
         result = conn.execute(text("SELECT * FROM some_table"))
         rows = result.all()
+        # The in-memory database is shared across tests. Leave the schema unchanged.
+        conn.execute(text("DROP TABLE some_table"))
     assert rows == [(1, 1), (2, 4)]
 
 
+@pytest.mark.parametrize(
+    "pragma, expected",
+    [
+        ("foreign_keys", 1),
+        ("synchronous", 0),
+        ("journal_mode", "memory"),
+        ("locking_mode", "exclusive"),
+        ("temp_store", 2),
+    ],
+)
+def test_mem_db_pragmas(mem_db: DbHandle, pragma: str, expected: int | str):
+    with mem_db.engine.connect() as conn:
+        assert conn.execute(text(f"PRAGMA {pragma}")).scalar() == expected
+
+
 def test_tables_in_mem_db_containing_minimal_objects(
     mem_db_containing_minimal_objects: Engine,
 ):
-    with Session(mem_db_containing_minimal_objects) as clean_session:
-        inspector = inspect(clean_session.bind)
-        tables = inspector.get_table_names()
-        assert tables == [
-            "book_tags",
-            "book_versions",
-            "books",
-            "highlight_tags",
-            "highlight_versions",
-            "highlights",
-            "readwise_batches",
-            "readwise_last_fetch",
-        ]
+    with mem_db_containing_minimal_objects.connect() as connection:
+        tables = mem_db_containing_minimal_objects.dialect.get_table_names(connection)
+    assert tables == TABLE_NAMES
 
 
 def test_minimal_book_as_orm_read_from_db_correctly(minimal_book_as_orm: Book):
@@ -491,19 +624,11 @@ def test_minimal_highlight_version_as_orm_and_updated_highlight(
 def test_tables_in_mem_db_containing_unnested_minimal_objects(
     mem_db_containing_unnested_minimal_objects: Engine,
 ):
-    with Session(mem_db_containing_unnested_minimal_objects) as clean_session:
-        inspector = inspect(clean_session.bind)
-        tables = inspector.get_table_names()
-        assert tables == [
-            "book_tags",
-            "book_versions",
-            "books",
-            "highlight_tags",
-            "highlight_versions",
-            "highlights",
-            "readwise_batches",
-            "readwise_last_fetch",
-        ]
+    with mem_db_containing_unnested_minimal_objects.connect() as connection:
+        tables = mem_db_containing_unnested_minimal_objects.dialect.get_table_names(
+            connection
+        )
+    assert tables == TABLE_NAMES
 
 
 def test_mem_db_containing_unnested_minimal_objects(
@@ -511,17 +636,13 @@ def test_mem_db_containing_unnested_minimal_objects(
 ):
     minimal_objects = unnested_minimal_objects()
     with Session(mem_db_containing_unnested_minimal_objects) as clean_session:
-        fetched_books = clean_session.scalars(select(Book)).all()
-        fetched_book_tags = clean_session.scalars(select(BookTag)).all()
-        fetched_highlights = clean_session.scalars(select(Highlight)).all()
-        fetched_highlight_tags = clean_session.scalars(select(HighlightTag)).all()
-        fetched_batches = clean_session.scalars(select(ReadwiseBatch)).all()
-
-        fetched_book = fetched_books[0]
-        fetched_book_tag = fetched_book_tags[0]
-        fetched_highlight = fetched_highlights[0]
-        fetched_highlight_tag = fetched_highlight_tags[0]
-        fetched_batch = fetched_batches[0]
+        fetched_book = clean_session.scalars(select(Book).limit(1)).first()
+        fetched_book_tag = clean_session.scalars(select(BookTag).limit(1)).first()
+        fetched_highlight = clean_session.scalars(select(Highlight).limit(1)).first()
+        fetched_highlight_tag = clean_session.scalars(
+            select(HighlightTag).limit(1)
+        ).first()
+        fetched_batch = clean_session.scalars(select(ReadwiseBatch).limit(1)).first()
 
         assert fetched_book.user_book_id == minimal_objects["min_book"]["user_book_id"]
         assert fetched_book_tag.id == minimal_objects["min_book_tag"]["id"]
@@ -607,7 +728,7 @@ def test_highlight_relationship_with_batch(minimal_highlight_as_orm: Highlight):
     assert minimal_highlight_as_orm.batch_id == BATCH_ID
     # Relationship.
     assert isinstance(minimal_highlight_as_orm.batch, ReadwiseBatch)
-    assert minimal_highlight_as_orm.batch.start_time == datetime(2025, 1, 1, 10, 10, 10)
+    assert minimal_highlight_as_orm.batch.start_time == START_TIME
     assert minimal_highlight_as_orm.batch.id == BATCH_ID
 
     assert minimal_highlight_as_orm.batch.highlights[0].id == MIN_HIGHLIGHT_1["id"]
@@ -689,63 +810,57 @@ def test_readwise_batch_relationship_with_highlight_tag(
     ],
 )
 def test_readwise_batch_relationships_with_version_objects(
-    mem_db_multi_version_unnested_minimal_objects,
+    multi_version_ro_session: Session,
     orm_class,
     expected_pk_value,
 ):
-    with Session(mem_db_multi_version_unnested_minimal_objects) as session:
-        # The book is added in batch 1 and updated in batch 2.
-        batch = session.get(ReadwiseBatch, 2)
-
-        # Check the updated object is in the batch.
-        updated_objs = getattr(batch, orm_class.__tablename__)
-        assert len(updated_objs) == 1
-        updated_obj = updated_objs[0]
-        assert isinstance(updated_obj, orm_class)
-        obj_pk = inspect(orm_class).primary_key[0].name
-        assert getattr(updated_obj, obj_pk) == expected_pk_value
-        assert updated_obj.batch_id == 2
-
-        # Check the book version is in the batch.
-        versioned_objs = getattr(batch, orm_class.version_class.batch_name)
-        assert len(versioned_objs) == 1
-        version_obj = versioned_objs[0]
-        assert isinstance(version_obj, orm_class.version_class)
-
-        # Foreign Keys
-        assert version_obj.batch_id_when_versioned == 2
-        assert version_obj.batch_id_when_new == 1
-        assert getattr(version_obj, obj_pk) == expected_pk_value
-
-        # Relationships
-        batch_when_versioned = version_obj.batch_when_versioned
-        assert isinstance(batch_when_versioned, ReadwiseBatch)
-        assert batch_when_versioned.id == 2
+    # The book is added in batch 1 and updated in batch 2.
+    batch = multi_version_ro_session.get(ReadwiseBatch, 2)
+
+    # Check the updated object is in the batch.
+    updated_objs = getattr(batch, orm_class.__tablename__)
+    assert len(updated_objs) == 1
+    updated_obj = updated_objs[0]
+    assert isinstance(updated_obj, orm_class)
+    obj_pk = inspect(orm_class).primary_key[0].name
+    assert getattr(updated_obj, obj_pk) == expected_pk_value
+    assert updated_obj.batch_id == 2
+
+    # Check the book version is in the batch.
+    versioned_objs = getattr(batch, orm_class.version_class.batch_name)
+    assert len(versioned_objs) == 1
+    version_obj = versioned_objs[0]
+    assert isinstance(version_obj, orm_class.version_class)
+
+    # Foreign Keys
+    assert version_obj.batch_id_when_versioned == 2
+    assert version_obj.batch_id_when_new == 1
+    assert getattr(version_obj, obj_pk) == expected_pk_value
+
+    # Relationships
+    batch_when_versioned = version_obj.batch_when_versioned
+    assert isinstance(batch_when_versioned, ReadwiseBatch)
+    assert batch_when_versioned.id == 2
 
 
-@pytest.mark.parametrize(
-    "field, expected",
-    [
-        (field, value)
-        for field, value in mock_validated_flat_objs()[0].items()
-        if field not in {"highlights", "book_tags"}
-    ],
-)
 def test_fetch_full_book_from_db_assert_standard_field_values(
-    mem_db_containing_full_objects: Engine, field: str, expected: Any
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_book = clean_session.get(Book, 12345)
-        actual = getattr(fetched_book, field)
-        assert actual == expected
+    expected = {
+        field: value
+        for field, value in MOCK_VALIDATED_FLAT_OBJS[0].items()
+        if field not in {"highlights", "book_tags"}
+    }
+    fetched_book = ro_session.get(Book, FULL_BOOK_ID)
+    actual = {field: getattr(fetched_book, field) for field in expected}
+    assert actual == expected
 
 
 def test_fetch_full_book_from_db_assert_foreign_key_values(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_book = clean_session.get(Book, 12345)
-        assert fetched_book.batch_id == 1
+    fetched_book = ro_session.get(Book, FULL_BOOK_ID)
+    assert fetched_book.batch_id == BATCH_ID
 
 
 @pytest.mark.parametrize(
@@ -757,42 +872,30 @@ def test_fetch_full_book_from_db_assert_foreign_key_values(
     ],
 )
 def test_fetch_full_book_from_db_assert_mapped_objects(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
     extract_obj_lambda: Callable,
     expected_type: type,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_book = clean_session.get(Book, 12345)
-        object_to_test = extract_obj_lambda(fetched_book)
-        assert isinstance(object_to_test, expected_type)
+    fetched_book = ro_session.get(Book, FULL_BOOK_ID)
+    object_to_test = extract_obj_lambda(fetched_book)
+    assert isinstance(object_to_test, expected_type)
 
 
-@pytest.mark.parametrize(
-    "field, expected",
-    [
-        (field, value)
-        for field, value in mock_validated_flat_objs()[0]["book_tags"][0].items()
-    ],
-)
 def test_fetch_full_book_tag_from_db_assert_standard_field_values(
-    mem_db_containing_full_objects: Engine, field: str, expected: Any
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_book_tag = clean_session.get(BookTag, 4041)
-        actual = getattr(fetched_book_tag, field)
-        assert actual == expected
+    expected = dict(MOCK_VALIDATED_FLAT_OBJS[0]["book_tags"][0])
+    fetched_book_tag = ro_session.get(BookTag, FULL_BOOK_TAG_ID)
+    actual = {field: getattr(fetched_book_tag, field) for field in expected}
+    assert actual == expected
 
 
 def test_fetch_full_book_tag_from_db_assert_foreign_key_values(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_book_tag = clean_session.get(BookTag, 4041)
-        assert (
-            fetched_book_tag.user_book_id
-            == mock_validated_flat_objs()[0]["user_book_id"]
-        )
-        assert fetched_book_tag.batch_id == 1
+    fetched_book_tag = ro_session.get(BookTag, FULL_BOOK_TAG_ID)
+    assert fetched_book_tag.user_book_id == FULL_BOOK_ID
+    assert fetched_book_tag.batch_id == BATCH_ID
 
 
 @pytest.mark.parametrize(
@@ -803,42 +906,34 @@ def test_fetch_full_book_tag_from_db_assert_foreign_key_values(
     ],
 )
 def test_fetch_full_book_tag_from_db_assert_mapped_objects(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
     extract_obj_lambda: Callable,
     expected_type: type,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_book_tag = clean_session.get(BookTag, 4041)
-        object_to_test = extract_obj_lambda(fetched_book_tag)
-        assert isinstance(object_to_test, expected_type)
+    fetched_book_tag = ro_session.get(BookTag, FULL_BOOK_TAG_ID)
+    object_to_test = extract_obj_lambda(fetched_book_tag)
+    assert isinstance(object_to_test, expected_type)
 
 
-@pytest.mark.parametrize(
-    "field, expected",
-    [
-        (field, value)
-        for field, value in mock_validated_flat_objs()[0]["highlights"][0].items()
-        if field != "tags"
-    ],
-)
 def test_fetch_full_highlight_from_db_assert_standard_field_values(
-    mem_db_containing_full_objects: Engine, field: str, expected: Any
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight = clean_session.get(Highlight, 10)
-        actual = getattr(fetched_highlight, field)
-        assert actual == expected
+    expected = {
+        field: value
+        for field, value in MOCK_VALIDATED_FLAT_OBJS[0]["highlights"][0].items()
+        if field != "tags"
+    }
+    fetched_highlight = ro_session.get(Highlight, FULL_HIGHLIGHT_ID)
+    actual = {field: getattr(fetched_highlight, field) for field in expected}
+    assert actual == expected
 
 
 def test_fetch_full_highlight_from_db_assert_foreign_key_values(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight = clean_session.get(Highlight, 10)
-        assert (
-            fetched_highlight.book_id == mock_validated_flat_objs()[0]["user_book_id"]
-        )
-        assert fetched_highlight.batch_id == 1
+    fetched_highlight = ro_session.get(Highlight, FULL_HIGHLIGHT_ID)
+    assert fetched_highlight.book_id == FULL_BOOK_ID
+    assert fetched_highlight.batch_id == BATCH_ID
 
 
 @pytest.mark.parametrize(
@@ -850,43 +945,30 @@ def test_fetch_full_highlight_from_db_assert_foreign_key_values(
     ],
 )
 def test_fetch_full_highlight_from_db_assert_mapped_objects(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
     extract_obj_lambda: Callable,
     expected_type: type,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight = clean_session.get(Highlight, 10)
-        object_to_test = extract_obj_lambda(fetched_highlight)
-        assert isinstance(object_to_test, expected_type)
+    fetched_highlight = ro_session.get(Highlight, FULL_HIGHLIGHT_ID)
+    object_to_test = extract_obj_lambda(fetched_highlight)
+    assert isinstance(object_to_test, expected_type)
 
 
-@pytest.mark.parametrize(
-    "field, expected",
-    [
-        (field, value)
-        for field, value in mock_validated_flat_objs()[0]["highlights"][0]["tags"][
-            0
-        ].items()
-    ],
-)
 def test_fetch_full_highlight_tag_from_db_assert_standard_field_values(
-    mem_db_containing_full_objects: Engine, field: str, expected: Any
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight_tag = clean_session.get(HighlightTag, 97654)
-        assert getattr(fetched_highlight_tag, field) == expected
+    expected = dict(MOCK_VALIDATED_FLAT_OBJS[0]["highlights"][0]["tags"][0])
+    fetched_highlight_tag = ro_session.get(HighlightTag, FULL_HIGHLIGHT_TAG_ID)
+    actual = {field: getattr(fetched_highlight_tag, field) for field in expected}
+    assert actual == expected
 
 
 def test_fetch_full_highlight_tag_from_db_assert_foreign_keys(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight_tag = clean_session.get(HighlightTag, 97654)
-        assert fetched_highlight_tag.batch_id == 1
-        assert (
-            fetched_highlight_tag.highlight_id
-            == mock_validated_flat_objs()[0]["highlights"][0]["id"]
-        )
+    fetched_highlight_tag = ro_session.get(HighlightTag, FULL_HIGHLIGHT_TAG_ID)
+    assert fetched_highlight_tag.batch_id == BATCH_ID
+    assert fetched_highlight_tag.highlight_id == FULL_HIGHLIGHT_ID
 
 
 @pytest.mark.parametrize(
@@ -897,30 +979,26 @@ def test_fetch_full_highlight_tag_from_db_assert_foreign_keys(
     ],
 )
 def test_fetch_full_highlight_tag_from_db_assert_mapped_objects(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
     extract_obj_lambda: Callable,
     expected_type: type,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight_tag = clean_session.get(HighlightTag, 97654)
-        object_to_test = extract_obj_lambda(fetched_highlight_tag)
-        assert isinstance(object_to_test, expected_type)
+    fetched_highlight_tag = ro_session.get(HighlightTag, FULL_HIGHLIGHT_TAG_ID)
+    object_to_test = extract_obj_lambda(fetched_highlight_tag)
+    assert isinstance(object_to_test, expected_type)
 
 
-@pytest.mark.parametrize(
-    "field, expected",
-    [
-        ("start_time", START_TIME),
-        ("end_time", END_TIME),
-        ("database_write_time", DATABASE_WRITE_TIME),
-    ],
-)
 def test_fetch_full_readwise_batch_from_db_assert_standard_field_values(
-    mem_db_containing_full_objects: Engine, field: str, expected: Any
+    ro_session: Session,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_batch = clean_session.get(ReadwiseBatch, 1)
-        assert getattr(fetched_batch, field) == expected
+    expected = {
+        "start_time": START_TIME,
+        "end_time": END_TIME,
+        "database_write_time": DATABASE_WRITE_TIME,
+    }
+    fetched_batch = ro_session.get(ReadwiseBatch, BATCH_ID)
+    actual = {field: getattr(fetched_batch, field) for field in expected}
+    assert actual == expected
 
 
 @pytest.mark.parametrize(
@@ -933,41 +1011,34 @@ def test_fetch_full_readwise_batch_from_db_assert_standard_field_values(
     ],
 )
 def test_fetch_full_readwise_batch_from_db_assert_mapped_objects(
-    mem_db_containing_full_objects: Engine,
+    ro_session: Session,
     extract_obj_lambda: Callable,
     expected_type: type,
 ):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_batch = clean_session.get(ReadwiseBatch, 1)
-        object_to_test = extract_obj_lambda(fetched_batch)
-        assert isinstance(object_to_test, expected_type)
+    fetched_batch = ro_session.get(ReadwiseBatch, BATCH_ID)
+    object_to_test = extract_obj_lambda(fetched_batch)
+    assert isinstance(object_to_test, expected_type)
 
 
-@pytest.mark.parametrize(
-    "target_obj, obj_id, expected",
-    [
-        (Book, 12345, "Book(user_book_id=12345, title='book title', highlights=1)"),
-        (HighlightTag, 97654, "HighlightTag(name='favourite', id=97654)"),
-        (
-            Highlight,
-            10,
-            "Highlight(id=10, book='book title', text='The highlight text')",
+def test_repr_methods_for_full_objects(full_objs: dict[tuple[type, int], Base]):
+    expected = {
+        (Book, FULL_BOOK_ID): (
+            "Book(user_book_id=12345, title='book title', highlights=1)"
         ),
-        (
-            ReadwiseBatch,
-            1,
+        (HighlightTag, FULL_HIGHLIGHT_TAG_ID): (
+            "HighlightTag(name='favourite', id=97654)"
+        ),
+        (Highlight, FULL_HIGHLIGHT_ID): (
+            "Highlight(id=10, book='book title', text='The highlight text')"
+        ),
+        (ReadwiseBatch, BATCH_ID): (
             "ReadwiseBatch(id=1, books=1, highlights=1, book_tags=1, highlight_tags=1, "
             "versioned_books=0, versioned_highlights=0, start=2025-01-01T10:10:10, "
-            "end=2025-01-01T10:10:20, write=2025-01-01T10:10:22)",
+            "end=2025-01-01T10:10:20, write=2025-01-01T10:10:22)"
         ),
-    ],
-)
-def test_repr_methods_for_full_objects(
-    mem_db_containing_full_objects: Engine, target_obj: type, obj_id: int, expected: str
-):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_obj = clean_session.get(target_obj, obj_id)
-        assert repr(fetched_obj) == expected
+    }
+    actual = {key: repr(full_objs[key]) for key in expected}
+    assert actual == expected
 
 
 @pytest.mark.parametrize(
@@ -982,44 +1053,40 @@ def test_repr_methods_for_full_objects(
     ],
 )
 def test_repr_methods_for_version_objects(
-    mem_db_multi_version_unnested_minimal_objects: Engine,
+    multi_version_ro_session: Session,
     target_obj: type,
     obj_id: int,
     expected: str,
 ):
-    with Session(mem_db_multi_version_unnested_minimal_objects) as clean_session:
-        fetched_obj = clean_session.get(target_obj, obj_id)
-        assert repr(fetched_obj) == expected
-
-
-def test_repr_for_long_highlights(mem_db_containing_full_objects: Engine):
-    with Session(mem_db_containing_full_objects) as clean_session:
-        fetched_highlight = clean_session.get(Highlight, 10)
-        fetched_highlight.text = "This is highlight text longer than 30 characters."
-        expected = (
-            "Highlight(id=10, book='book title', "
-            "text='This is highlight text longer ...')"
-        )
-        assert repr(fetched_highlight) == expected
+    fetched_obj = multi_version_ro_session.get(target_obj, obj_id)
+    assert repr(fetched_obj) == expected
 
 
-@pytest.mark.parametrize(
-    "obj, expected",
-    [
-        (Book, "Book(user_book_id=None, title=None, highlights=0)"),
-        (BookTag, "BookTag(name=None, id=None)"),
-        (Highlight, "Highlight(id=None, text=None)"),
-        (HighlightTag, "HighlightTag(name=None, id=None)"),
-        (
-            ReadwiseBatch,
+def test_repr_for_long_highlights():
+    highlight = Highlight(
+        id=10,
+        text="This is highlight text longer than 30 characters.",
+        book=Book(title="book title"),
+    )
+    expected = (
+        "Highlight(id=10, book='book title', text='This is highlight text longer ...')"
+    )
+    assert repr(highlight) == expected
+
+
+def test_repr_for_empty_objects():
+    expected = {
+        Book: "Book(user_book_id=None, title=None, highlights=0)",
+        BookTag: "BookTag(name=None, id=None)",
+        Highlight: "Highlight(id=None, text=None)",
+        HighlightTag: "HighlightTag(name=None, id=None)",
+        ReadwiseBatch: (
             "ReadwiseBatch(id=None, books=0, highlights=0, book_tags=0, "
-            "highlight_tags=0, versioned_books=0, versioned_highlights=0)",
+            "highlight_tags=0, versioned_books=0, versioned_highlights=0)"
         ),
-    ],
-)
-def test_repr_for_empty_objects(obj: type, expected: str):
-    mock_obj = obj()
-    assert repr(mock_obj) == expected
+    }
+    actual = {obj: repr(obj()) for obj in expected}
+    assert actual == expected
 
 
 def test_orm_mapped_book_prevents_duplicate_user_book_ids(mem_db: DbHandle):
@@ -1033,8 +1100,7 @@ def test_orm_mapped_book_prevents_duplicate_user_book_ids(mem_db: DbHandle):
     # duplicates.
     highlight_tag_2_as_orm = HighlightTag(**MIN_HIGHLIGHT_1_TAG_2)
     highlight_2_as_orm = Highlight(**MIN_HIGHLIGHT_2, tags=[highlight_tag_2_as_orm])
-    MIN_BOOK["title"] = "book_2"
-    book_2 = Book(**MIN_BOOK, highlights=[highlight_2_as_orm])
+    book_2 = Book(**{**MIN_BOOK, "title": "book_2"}, highlights=[highlight_2_as_orm])
 
     batch.books = [book_1, book_2]
     batch.highlights = [highlight_1_as_orm, highlight_2_as_orm]
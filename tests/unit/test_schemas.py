@@ -1,54 +1,58 @@
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Union
 
 import pytest
 from pydantic import ValidationError
 
 from readwise_local_plus.pipeline import SCHEMAS_BY_OBJECT
-from readwise_local_plus.schemas import (
-    BookSchemaUnnested,
-    BookTagsSchema,
-    HighlightSchemaUnnested,
-    HighlightTagsSchema,
-)
 from tests.helpers import flat_mock_api_response_nested_validated
 
+OBJECT_TYPES = ("books", "book_tags", "highlights", "highlight_tags")
+
+# The API fields of each object in a flattened, nested validated API response. The
+# mock response has one object per object type. Built once: use
+# ``flat_objects_api_fields_only`` for a copy.
+API_FIELDS_ONLY = {
+    obj_type: {
+        k: v
+        for k, v in objs[0].items()
+        if k in SCHEMAS_BY_OBJECT[obj_type].model_fields
+    }
+    for obj_type, objs in flat_mock_api_response_nested_validated().items()
+}
+
 # ----------------
 # Helper Functions
 # ----------------
 
 
-def flat_objects_api_fields_only() -> dict[str, list[dict[str, Any]]]:
+def flat_objects_api_fields_only() -> dict[str, dict[str, Any]]:
     """
-    Extract only the API fields from an flattened API response that is nested validated.
+    Return a copy of the API fields of a flattened, nested validated API response.
 
     Pydantic validation is only carried out on the API fields. Replicate that content
     for testing pydantic schema.
 
+    The objects are shallow copies of ``API_FIELDS_ONLY``. This is enough for tests to
+    add, remove or replace fields, as all the values are immutable.
+
     Returns
     -------
-    dict[str, list[dict[str, Any]]]
-        A dictionary where keys are object types and values are lists of objects: one
-        object per object type.
+    dict[str, dict[str, Any]]
+        A dictionary where keys are object types and values are an object of that type.
     """
-    flattened_nested_validated_data = flat_mock_api_response_nested_validated()
-    objs_with_only_api_fields = {}
-    for obj_type, objs in flattened_nested_validated_data.items():
-        obj_schema = SCHEMAS_BY_OBJECT[obj_type]
-        for obj in objs:
-            obj_with_api_fields_only = {
-                k: v for k, v in obj.items() if k in obj_schema.model_fields.keys()
-            }
-            objs_with_only_api_fields[obj_type] = obj_with_api_fields_only
-    return objs_with_only_api_fields
+    return {obj_type: dict(obj) for obj_type, obj in API_FIELDS_ONLY.items()}
 
 
+@lru_cache(maxsize=1)
 def expected_type_per_schema_field() -> dict[str, dict[str, list[str]]]:
     """
     A dictionary grouping schema fields by expected type and by schema object.
 
-    Used for dynamically generating test cases. Use a function rather than a constant
-    to ensure test isolation.
+    Used for dynamically generating test cases. The result is cached and shared by
+    every caller, so it must not be mutated.
 
     Returns
     -------
@@ -116,24 +120,24 @@ def generate_invalid_types_test_cases() -> list[tuple[str, Union[str, int], str]
         "list_of_highlights": [123, "abc", [{"a": 1, "b": 2}]],
     }
 
-    test_cases = []
-    for obj, field_group in expected_type_per_schema_field().items():
-        for expected_type, fields in field_group.items():
-            for field in fields:
-                for invalid_value in invalid_values[expected_type]:
-                    test_cases.append((obj, field, invalid_value))
-    return test_cases
+    return [
+        (obj, field, invalid_value)
+        for obj, field_group in expected_type_per_schema_field().items()
+        for expected_type, fields in field_group.items()
+        for field in fields
+        for invalid_value in invalid_values[expected_type]
+    ]
 
 
-def generate_field_nullability_test_cases() -> dict[str, list[tuple]]:
+def generate_field_nullability_test_cases() -> dict[str, tuple[tuple[str, str], ...]]:
     """
     Generate parametrized test cases to check field nullability configurations.
 
     Returns
     -------
-    dict[str[list[tuple]]]
+    dict[str, tuple[tuple[str, str], ...]]
         A dictionary with the keys ``error`` and ``pass``. The values for each are a
-        list of test cases in the form ``(obj, field)``.
+        tuple of test cases in the form ``(obj, field)``.
     """
     non_nullable_fields = {
         "books": [
@@ -150,12 +154,30 @@ def generate_field_nullability_test_cases() -> dict[str, list[tuple]]:
     }
     nullable_test_cases = {"pass": [], "error": []}
     for obj, schema in SCHEMAS_BY_OBJECT.items():
-        for field in schema.model_fields.keys():
+        for field in schema.model_fields:
             if field in non_nullable_fields[obj]:
                 nullable_test_cases["error"].append((obj, field))
             else:
                 nullable_test_cases["pass"].append((obj, field))
-    return nullable_test_cases
+    return {bucket: tuple(cases) for bucket, cases in nullable_test_cases.items()}
+
+
+# Generated once at import, rather than in the parametrize decorators.
+INVALID_TYPES_TEST_CASES = tuple(generate_invalid_types_test_cases())
+FIELD_NULLABILITY_TEST_CASES = generate_field_nullability_test_cases()
+
+# Test cases for the missing field tests, in the form ``(obj, field)``. Book and
+# highlight fields are required, tag fields are optional.
+REQUIRED_FIELD_TEST_CASES = tuple(
+    (obj_type, field)
+    for obj_type in ("books", "highlights")
+    for field in API_FIELDS_ONLY[obj_type]
+)
+OPTIONAL_FIELD_TEST_CASES = tuple(
+    (obj_type, field)
+    for obj_type in ("book_tags", "highlight_tags")
+    for field in API_FIELDS_ONLY[obj_type]
+)
 
 
 # --------------------------
@@ -163,15 +185,16 @@ def generate_field_nullability_test_cases() -> dict[str, list[tuple]]:
 # --------------------------
 
 
-@pytest.mark.parametrize(
-    "object_type", ["books", "book_tags", "highlights", "highlight_tags"]
-)
+@pytest.mark.parametrize("object_type", OBJECT_TYPES)
 def test_fields_in_expected_type_per_schema_match_object_schema(object_type: str):
-    book_fields = SCHEMAS_BY_OBJECT[object_type].model_fields
-    book_fields_expected_types_dict = []
-    for list_of_fields in expected_type_per_schema_field()[object_type].values():
-        book_fields_expected_types_dict.extend(list_of_fields)
-    assert sorted(book_fields) == sorted(book_fields_expected_types_dict)
+    schema_fields = SCHEMAS_BY_OBJECT[object_type].model_fields
+    expected_type_fields = [
+        field
+        for fields in expected_type_per_schema_field()[object_type].values()
+        for field in fields
+    ]
+    # A Counter, rather than a set, so a field listed under two types still fails.
+    assert Counter(schema_fields.keys()) == Counter(expected_type_fields)
 
 
 def test_generate_invalid_field_values_test_cases():
@@ -181,7 +204,7 @@ def test_generate_invalid_field_values_test_cases():
 
 def test_generate_field_nullability_test_cases():
     test_cases = generate_field_nullability_test_cases()
-    assert list(test_cases.keys()) == ["pass", "error"]
+    assert list(test_cases) == ["pass", "error"]
     assert test_cases["pass"][0] == ("books", "is_deleted")
     assert test_cases["pass"][1] == ("books", "author")
     assert test_cases["error"][0] == ("books", "user_book_id")
@@ -192,9 +215,7 @@ def test_generate_field_nullability_test_cases():
 # -----
 
 
-@pytest.mark.parametrize(
-    "object_type", ["books", "book_tags", "highlights", "highlight_tags"]
-)
+@pytest.mark.parametrize("object_type", OBJECT_TYPES)
 def test_flat_schema_configuration_by_object(object_type: str):
     schema = SCHEMAS_BY_OBJECT[object_type]
     test_object = flat_objects_api_fields_only()[object_type]
@@ -259,7 +280,8 @@ def test_flat_schema_model_dump_output(object_type: str, expected: dict[str, Any
 
 @pytest.mark.parametrize(
     "object_type, target_field, invalid_value",
-    generate_invalid_types_test_cases(),
+    INVALID_TYPES_TEST_CASES,
+    ids=[f"{obj}-{field}-{value!r}" for obj, field, value in INVALID_TYPES_TEST_CASES],
 )
 def test_flat_schema_configuration_with_invalid_values(
     object_type: str,
@@ -274,7 +296,7 @@ def test_flat_schema_configuration_with_invalid_values(
 
 
 @pytest.mark.parametrize(
-    "object_type, field_to_null", generate_field_nullability_test_cases()["pass"]
+    "object_type, field_to_null", FIELD_NULLABILITY_TEST_CASES["pass"]
 )
 def test_flat_schema_configuration_fields_allow_null(
     object_type: str,
@@ -287,7 +309,7 @@ def test_flat_schema_configuration_fields_allow_null(
 
 
 @pytest.mark.parametrize(
-    "object_type, field_to_null", generate_field_nullability_test_cases()["error"]
+    "object_type, field_to_null", FIELD_NULLABILITY_TEST_CASES["error"]
 )
 def test_flat_schema_configuration_fields_error_for_null(
     object_type: str,
@@ -300,46 +322,24 @@ def test_flat_schema_configuration_fields_error_for_null(
         schema(**object_under_test)
 
 
-@pytest.mark.parametrize(
-    "field_to_remove", flat_objects_api_fields_only()["books"].keys()
-)
-def test_missing_book_fields_raise_errors(field_to_remove: str):
-    mock_book = flat_objects_api_fields_only()["books"]
-    del mock_book[field_to_remove]
-    with pytest.raises(ValidationError):
-        BookSchemaUnnested(**mock_book)
-
-
-@pytest.mark.parametrize(
-    "field_to_remove", flat_objects_api_fields_only()["highlights"].keys()
-)
-def test_missing_highlight_fields_raise_errors(field_to_remove: str):
-    mock_highlight = flat_objects_api_fields_only()["highlights"]
-    del mock_highlight[field_to_remove]
+@pytest.mark.parametrize("object_type, field_to_remove", REQUIRED_FIELD_TEST_CASES)
+def test_missing_fields_raise_errors(object_type: str, field_to_remove: str):
+    object_under_test = flat_objects_api_fields_only()[object_type]
+    del object_under_test[field_to_remove]
+    schema = SCHEMAS_BY_OBJECT[object_type]
     with pytest.raises(ValidationError):
-        HighlightSchemaUnnested(**mock_highlight)
-
-
-@pytest.mark.parametrize(
-    "field_to_remove", flat_objects_api_fields_only()["book_tags"].keys()
-)
-def test_missing_book_tag_fields_do_not_raise_errors(field_to_remove: str):
-    mock_book_tags = flat_objects_api_fields_only()["book_tags"]
-    del mock_book_tags[field_to_remove]
-    BookTagsSchema(**mock_book_tags)
+        schema(**object_under_test)
 
 
-@pytest.mark.parametrize(
-    "field_to_remove",
-    flat_objects_api_fields_only()["highlight_tags"].keys(),
-)
-def test_missing_highlight_tag_fields_do_not_raise_errors(field_to_remove: str):
-    mock_highlight_tags = flat_objects_api_fields_only()["book_tags"]
-    del mock_highlight_tags[field_to_remove]
-    HighlightTagsSchema(**mock_highlight_tags)
+@pytest.mark.parametrize("object_type, field_to_remove", OPTIONAL_FIELD_TEST_CASES)
+def test_missing_tag_fields_do_not_raise_errors(object_type: str, field_to_remove: str):
+    object_under_test = flat_objects_api_fields_only()[object_type]
+    del object_under_test[field_to_remove]
+    schema = SCHEMAS_BY_OBJECT[object_type]
+    assert schema(**object_under_test)
 
 
-@pytest.mark.parametrize("object_under_test", flat_objects_api_fields_only().keys())
+@pytest.mark.parametrize("object_under_test", API_FIELDS_ONLY)
 def test_additional_object_field_raises_error(object_under_test: str):
     mock_obj = flat_objects_api_fields_only()[object_under_test]
     mock_obj["extra_field"] = None
@@ -1,16 +1,12 @@
 import json
-import tempfile
 from datetime import datetime
-from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 from readwise_local_plus.config import UserConfig
+from readwise_local_plus.db_operations import get_session
 from readwise_local_plus.models import (
-    Base,
     Book,
     BookTag,
     Highlight,
@@ -132,6 +128,9 @@ def test_readwise_api_fetch_since_custom_date(
     mock_user_config = MagicMock(spec=UserConfig)
     mock_fetch_user_config.return_value = mock_user_config
     mock_fetch_api.return_value = mock_api_response()
+    # Built separately from the return value, so an in-place change to the response
+    # fails the comparisons.
+    expected = mock_api_response()
 
     actual = readwise_api_fetch_since_custom_date("2024-07-01T00:00:00", log=True)
 
@@ -139,14 +138,16 @@ def test_readwise_api_fetch_since_custom_date(
     mock_fetch_api.assert_called_once_with(
         last_fetch="2024-07-01T00:00:00", user_config=mock_user_config
     )
-    mock_log_stdout.assert_called_once_with(mock_api_response(), "2024-07-01T00:00:00")
+    mock_log_stdout.assert_called_once_with(expected, "2024-07-01T00:00:00")
     mock_write_json.assert_called_once_with(
-        mock_api_response(), "2024-07-01T00:00:00", mock_user_config
+        expected, "2024-07-01T00:00:00", mock_user_config
     )
-    assert actual == mock_api_response()
+    assert actual == expected
 
 
-def test_list_invalid_db_objects(capsys: pytest.CaptureFixture[str]):
+def test_list_invalid_db_objects(
+    mem_db_shared: str, capsys: pytest.CaptureFixture[str]
+):
     orm_models = [Book, BookTag, Highlight, HighlightTag]
     test_objects = flat_mock_api_response_fully_validated()
     test_objects = [obj[0] for obj in test_objects.values()]
@@ -160,38 +161,32 @@ def test_list_invalid_db_objects(capsys: pytest.CaptureFixture[str]):
         model(**obj, batch=batch) for model, obj in zip(orm_models, test_objects)
     ]
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        db_path = Path(tmp_dir) / "test.db"
-        engine = create_engine(f"sqlite:///{db_path}")
-        Session = sessionmaker(bind=engine)
-        Base.metadata.create_all(engine)
-
-        with Session() as session:
-            session.add(batch)
-            session.flush()
-            session.add_all(orm_models)
-            batch.database_write_time = ANY_TIME
-            session.commit()
-
-            mock_user_config = Mock()
-            mock_user_config.db_path = db_path
-
-            list_invalid_db_objects(mock_user_config)
-
-            captured = capsys.readouterr()
-            actual = captured.out
-
-            # These are the actual instances but we're only using their string
-            # representation.
-            expected = (
-                f"4 invalid objects found:\n"
-                f"[Book] {orm_models[0]}\n"
-                f"  - mock_field: mock_error\n"
-                f"[BookTag] {orm_models[1]}\n"
-                f"  - mock_field: mock_error\n"
-                f"[Highlight] {orm_models[2]}\n"
-                f"  - mock_field: mock_error\n"
-                f"[HighlightTag] {orm_models[3]}\n"
-                f"  - mock_field: mock_error\n"
-            )
-            assert actual == expected
+    with get_session(mem_db_shared) as session:
+        session.add(batch)
+        session.flush()
+        session.add_all(orm_models)
+        batch.database_write_time = ANY_TIME
+        session.commit()
+
+        mock_user_config = Mock()
+        mock_user_config.db_path = mem_db_shared
+
+        list_invalid_db_objects(mock_user_config)
+
+        captured = capsys.readouterr()
+        actual = captured.out
+
+        # These are the actual instances but we're only using their string
+        # representation.
+        expected = (
+            f"4 invalid objects found:\n"
+            f"[Book] {orm_models[0]}\n"
+            f"  - mock_field: mock_error\n"
+            f"[BookTag] {orm_models[1]}\n"
+            f"  - mock_field: mock_error\n"
+            f"[Highlight] {orm_models[2]}\n"
+            f"  - mock_field: mock_error\n"
+            f"[HighlightTag] {orm_models[3]}\n"
+            f"  - mock_field: mock_error\n"
+        )
+        assert actual == expected